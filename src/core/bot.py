@@ -13,6 +13,7 @@ from datetime import datetime, timezone
 from config.settings import Settings
 from config.logging_config import LoggerMixin
 from core.exceptions import OSRSBotException, handle_exception
+from utils.rate_limiter import api_rate_limiter
 
 
 class OSRSBot(commands.Bot, LoggerMixin):
@@ -172,6 +173,7 @@ class OSRSBot(commands.Bot, LoggerMixin):
         self.competition_monitor.start()
         self.cleanup_task.start()
         self.stats_update.start()
+        api_rate_limiter.start()
         
         self.logger.info("Background tasks started")
     
@@ -378,6 +380,7 @@ class OSRSBot(commands.Bot, LoggerMixin):
             self.competition_monitor.cancel()
             self.cleanup_task.cancel()
             self.stats_update.cancel()
+        await api_rate_limiter.stop()
         
         # Close repositories if they exist
         # (Add any cleanup needed for repositories)
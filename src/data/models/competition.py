@@ -11,6 +11,7 @@ from datetime import datetime
 from enum import Enum
 
 from core.exceptions import ValidationError, CompetitionError
+from utils.time_utils import iso_to_unix_seconds
 
 
 class CompetitionStatus(Enum):
@@ -171,6 +172,11 @@ class Competition:
         
         self.validate()
     
+    @property
+    def start_time_epoch(self) -> float:
+        """start_time as Unix seconds (the conversion is cached per timestamp)."""
+        return iso_to_unix_seconds(self.start_time)
+    
     def validate(self) -> None:
         """
         Validate competition data integrity.
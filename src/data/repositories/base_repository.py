@@ -54,7 +54,11 @@ class BaseRepository(ABC, LoggerMixin, Generic[T]):
     
     async def _initialize_file(self) -> None:
         """Initialize the JSON file with default structure if it doesn't exist."""
-        if not self.file_path.exists():
+        # Held so the background init task and an explicit call can't both write
+        async with self._lock:
+            if self.file_path.exists():
+                return
+            
             try:
                 default_data = self._get_default_structure()
                 await self._write_file(default_data)
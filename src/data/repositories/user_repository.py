@@ -23,8 +23,63 @@ class UserRepository(BaseRepository[User]):
     
     def __init__(self, file_path: str):
         """Initialize user repository."""
+        # Case-folded OSRS username -> Discord ID, kept in sync on every write
+        self._osrs_index: Dict[str, int] = {}
+        self._osrs_index_loaded = False
+        # metadata.last_updated of the snapshot the index was built from
+        self._osrs_index_stamp: Optional[str] = None
         super().__init__(file_path, User)
     
+    async def _initialize_file(self) -> None:
+        """Initialize the JSON file and build the OSRS username index."""
+        await super()._initialize_file()
+        if not self._osrs_index_loaded:
+            self._rebuild_osrs_index(await self.load_data())
+    
+    @staticmethod
+    def _normalize_username(osrs_username: str) -> str:
+        """Return the case-insensitive key used for OSRS username lookups."""
+        return osrs_username.casefold()
+    
+    def _rebuild_osrs_index(self, data: Dict[str, Any]) -> None:
+        """Rebuild the OSRS username index from a full data snapshot."""
+        self._osrs_index = {
+            self._normalize_username(user_data["osrs_username"]): user_data["discord_id"]
+            for user_data in data["users"].values()
+            if user_data.get("osrs_username")
+        }
+        self._osrs_index_loaded = True
+        self._osrs_index_stamp = data.get("metadata", {}).get("last_updated")
+    
+    def _index_user(self, old_data: Optional[Dict[str, Any]],
+                    new_data: Optional[Dict[str, Any]]) -> None:
+        """Move a user's OSRS username index entry from old_data to new_data."""
+        if old_data and old_data.get("osrs_username"):
+            old_key = self._normalize_username(old_data["osrs_username"])
+            if self._osrs_index.get(old_key) == old_data["discord_id"]:
+                del self._osrs_index[old_key]
+        
+        if new_data and new_data.get("osrs_username"):
+            new_key = self._normalize_username(new_data["osrs_username"])
+            self._osrs_index[new_key] = new_data["discord_id"]
+    
+    async def _save_and_index(self, data: Dict[str, Any],
+                              old_data: Optional[Dict[str, Any]],
+                              new_data: Optional[Dict[str, Any]]) -> None:
+        """
+        Save data and move one user's OSRS username index entry.
+        
+        The index is only updated in place if it matched the snapshot being
+        saved; otherwise the stale stamp makes the next lookup rebuild it.
+        """
+        in_sync = (self._osrs_index_loaded and
+                   self._osrs_index_stamp == data.get("metadata", {}).get("last_updated"))
+        await self.save_data(data)
+        if in_sync:
+            self._index_user(old_data, new_data)
+            # save_data stamps metadata.last_updated in place
+            self._osrs_index_stamp = data["metadata"]["last_updated"]
+    
     def _get_default_structure(self) -> Dict[str, Any]:
         """Return the default JSON structure for users."""
         return {
@@ -100,9 +155,10 @@ class UserRepository(BaseRepository[User]):
         
         # Save to repository
         data = await self.load_data()
-        data["users"][str(discord_id)] = user.to_dict()
+        user_data = user.to_dict()
+        data["users"][str(discord_id)] = user_data
         data["metadata"]["total_users"] = len(data["users"])
-        await self.save_data(data)
+        await self._save_and_index(data, None, user_data)
         
         self.logger.info(
             f"Created new user: {discord_id}",
@@ -139,14 +195,29 @@ class UserRepository(BaseRepository[User]):
             User object or None if not found
         """
         data = await self.load_data()
-        username_lower = osrs_username.lower()
+        username_key = self._normalize_username(osrs_username)
         
-        for user_data in data["users"].values():
-            if (user_data.get("osrs_username") and 
-                user_data["osrs_username"].lower() == username_lower):
-                return User.from_dict(user_data)
+        # Any write, ours or another process's, stamps the file; a changed stamp
+        # means the index may be missing users, so rebuild from this snapshot
+        if (not self._osrs_index_loaded or
+                self._osrs_index_stamp != data.get("metadata", {}).get("last_updated")):
+            self._rebuild_osrs_index(data)
         
-        return None
+        discord_id = self._osrs_index.get(username_key)
+        if discord_id is None:
+            return None
+        
+        user_data = data["users"].get(str(discord_id))
+        if (not user_data or not user_data.get("osrs_username") or
+                self._normalize_username(user_data["osrs_username"]) != username_key):
+            # Index is stale (file changed underneath us); rebuild and retry once
+            self._rebuild_osrs_index(data)
+            discord_id = self._osrs_index.get(username_key)
+            if discord_id is None:
+                return None
+            user_data = data["users"][str(discord_id)]
+        
+        return User.from_dict(user_data)
     
     async def get_user_by_wise_old_man_id(self, wom_id: int) -> Optional[User]:
         """
@@ -186,8 +257,10 @@ class UserRepository(BaseRepository[User]):
         user.update_activity()
         
         # Save updated user data
-        data["users"][user_id_str] = user.to_dict()
-        await self.save_data(data)
+        old_data = data["users"][user_id_str]
+        user_data = user.to_dict()
+        data["users"][user_id_str] = user_data
+        await self._save_and_index(data, old_data, user_data)
         
         self.logger.debug(f"Updated user: {user.discord_id}")
     
@@ -205,9 +278,9 @@ class UserRepository(BaseRepository[User]):
         user_id_str = str(discord_id)
         
         if user_id_str in data["users"]:
-            del data["users"][user_id_str]
+            old_data = data["users"].pop(user_id_str)
             data["metadata"]["total_users"] = len(data["users"])
-            await self.save_data(data)
+            await self._save_and_index(data, old_data, None)
             
             self.logger.info(f"Deleted user: {discord_id}")
             return True
@@ -338,6 +411,41 @@ class UserRepository(BaseRepository[User]):
         
         return user
     
+    async def add_competition_participations(self, discord_id: int,
+                                             results: List[bool]) -> User:
+        """
+        Record several competition results for a user in a single write.
+        
+        Args:
+            discord_id: Discord user ID
+            results: Whether the user won each competition, in order
+            
+        Returns:
+            Updated user object
+            
+        Raises:
+            UserNotFoundError: If user doesn't exist
+        """
+        user = await self.get_user_by_discord_id(discord_id)
+        if not user:
+            raise UserNotFoundError(str(discord_id))
+        
+        if not results:
+            return user
+        
+        for won in results:
+            user.add_competition_participation(won)
+        await self.update_user(user)
+        
+        wins = sum(1 for won in results if won)
+        self.logger.info(
+            f"Added {len(results)} competition participations for user {discord_id} "
+            f"(wins: {wins})",
+            extra={"discord_id": discord_id, "competitions": len(results), "wins": wins}
+        )
+        
+        return user
+    
     async def add_user_achievement(self, discord_id: int, achievement: str) -> bool:
         """
         Add an achievement to a user.
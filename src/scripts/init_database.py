@@ -12,7 +12,9 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple
+
+import aiofiles
 
 # Add the parent directory to the path to import bot modules
 sys.path.append(str(Path(__file__).parent.parent))
@@ -23,6 +25,20 @@ from data.repositories.competition_repository import CompetitionRepository
 from data.repositories.leaderboard_repository import LeaderboardRepository
 
 
+class SampleUser(NamedTuple):
+    """Sample user created by the optional test data step."""
+    discord_id: int
+    osrs_username: str
+    display_name: str
+
+
+SAMPLE_USERS = (
+    SampleUser(123456789012345678, "SampleUser1", "Sample User 1"),
+    SampleUser(123456789012345679, "SampleUser2", "Sample User 2"),
+    SampleUser(123456789012345680, "SampleUser3", "Sample User 3"),
+)
+
+
 async def create_directory_structure(settings: Settings) -> None:
     """Create necessary directory structure."""
     print("Creating directory structure...")
@@ -150,8 +166,10 @@ async def create_trivia_questions(settings: Settings) -> None:
     trivia_file = Path(settings.database.trivia_questions_file)
     trivia_file.parent.mkdir(parents=True, exist_ok=True)
     
-    with open(trivia_file, 'w', encoding='utf-8') as f:
-        json.dump(trivia_data, f, indent=2, ensure_ascii=False)
+    # Serialize up front so the file is written in a single non-blocking call
+    payload = json.dumps(trivia_data, indent=2, ensure_ascii=False)
+    async with aiofiles.open(trivia_file, 'w', encoding='utf-8') as f:
+        await f.write(payload)
     
     print(f"  ✓ Created trivia database with {len(trivia_data['questions'])} questions")
 
@@ -173,30 +191,27 @@ async def create_sample_data(settings: Settings) -> None:
     lb_repo = LeaderboardRepository(settings.database.leaderboards_file)
     
     # Create sample users
-    sample_users = [
-        {"discord_id": 123456789012345678, "osrs_username": "SampleUser1", "display_name": "Sample User 1"},
-        {"discord_id": 123456789012345679, "osrs_username": "SampleUser2", "display_name": "Sample User 2"},
-        {"discord_id": 123456789012345680, "osrs_username": "SampleUser3", "display_name": "Sample User 3"},
-    ]
-    
-    for user_data in sample_users:
+    for sample_user in SAMPLE_USERS:
         try:
-            user = await user_repo.create_user(**user_data)
-            # Add some competition participation
-            await user_repo.add_competition_participation(user.discord_id, won=True)
-            await user_repo.add_competition_participation(user.discord_id, won=False)
-            print(f"  ✓ Created sample user: {user_data['osrs_username']}")
+            user = await user_repo.create_user(
+                discord_id=sample_user.discord_id,
+                osrs_username=sample_user.osrs_username,
+                display_name=sample_user.display_name
+            )
+            # Add some competition participation (one win, one loss)
+            await user_repo.add_competition_participations(user.discord_id, [True, False])
+            print(f"  ✓ Created sample user: {sample_user.osrs_username}")
         except Exception as e:
-            print(f"  ⚠ Failed to create user {user_data['osrs_username']}: {e}")
+            print(f"  ⚠ Failed to create user {sample_user.osrs_username}: {e}")
     
     # Update leaderboards
     collection = await lb_repo.get_leaderboard_collection()
-    for user_data in sample_users:
+    for sample_user in SAMPLE_USERS:
         await lb_repo.update_all_time_leaderboards(
-            user_data["discord_id"], 
+            sample_user.discord_id, 
             "skill_competition", 
             won=True,
-            display_name=user_data["display_name"]
+            display_name=sample_user.display_name
         )
     
     print("  ✓ Sample data created successfully")
@@ -217,8 +232,8 @@ async def verify_setup(settings: Settings) -> None:
     for file_path in files_to_check:
         if Path(file_path).exists():
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.loads(await f.read())
                 print(f"  ✓ {file_path} - Valid JSON")
             except json.JSONDecodeError:
                 print(f"  ❌ {file_path} - Invalid JSON")
@@ -0,0 +1,126 @@
+"""
+Tests for the token bucket rate limiter.
+
+Covers Retry-After pause handling, the background cleanup task's
+lifecycle and which buckets cleanup is allowed to drop.
+"""
+
+import asyncio
+
+import pytest
+
+from utils.rate_limiter import APIRateLimiter, RateLimitBucket, RateLimiter
+
+
+class TestRateLimitBucketPause:
+    """Test suite for RateLimitBucket pause (Retry-After) handling."""
+    
+    @pytest.fixture
+    def paused_bucket(self):
+        """Provide an empty bucket refilling 2 tokens/s, paused from t=100 until t=110."""
+        bucket = RateLimitBucket(
+            capacity=10,
+            refill_rate=2.0,
+            last_refill=100.0,
+            paused_until=110.0
+        )
+        # tokens=0.0 in the constructor means full, so drain it afterwards
+        bucket.tokens = 0.0
+        return bucket
+    
+    def test_no_tokens_granted_during_pause(self, paused_bucket):
+        """Test that no tokens accrue or are consumed while paused."""
+        assert not paused_bucket.consume(1, now=105.0)
+        assert not paused_bucket.consume(1, now=109.9)
+        assert paused_bucket.get_remaining_tokens(now=109.9) == pytest.approx(0.0)
+    
+    def test_tokens_accrue_from_pause_end(self, paused_bucket):
+        """Test that refills count from the end of the pause, not the last refill."""
+        # Refills before and during the pause must not bank time either
+        paused_bucket.get_remaining_tokens(now=105.0)
+        
+        assert paused_bucket.get_remaining_tokens(now=110.0) == pytest.approx(0.0)
+        assert paused_bucket.get_remaining_tokens(now=111.0) == pytest.approx(2.0)
+        assert paused_bucket.consume(2, now=111.0)
+        assert not paused_bucket.consume(1, now=111.0)
+    
+    def test_time_until_available_includes_pause(self, paused_bucket):
+        """Test that the wait is the remaining pause plus the refill time."""
+        # 6s of pause left, then 3 tokens at 2 tokens/s
+        assert paused_bucket.time_until_available(3, now=104.0) == pytest.approx(6.0 + 1.5)
+        assert paused_bucket.peek_wait(3, now=104.0) == pytest.approx(7.5)
+        
+        # Tokens on hand don't shorten the pause
+        paused_bucket.tokens = 5.0
+        assert paused_bucket.time_until_available(1, now=104.0) == pytest.approx(6.0)
+        assert paused_bucket.time_until_available(1, now=110.0) == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_api_bucket(self):
+        """Test that a Retry-After response drains the bucket for the given time."""
+        limiter = APIRateLimiter()
+        assert await limiter.acquire("wise_old_man")
+        
+        await limiter.handle_rate_limit_response("wise_old_man", {"Retry-After": "5"})
+        
+        assert not await limiter.acquire("wise_old_man")
+        status = await limiter.get_status("wise_old_man")
+        assert status["remaining_tokens"] == pytest.approx(0.0)
+        assert status["time_until_refill"] == pytest.approx(5.0 + 1.0, abs=0.05)
+        await limiter.stop()
+
+
+class TestRateLimiterCleanup:
+    """Test suite for RateLimiter bucket cleanup."""
+    
+    @pytest.mark.asyncio
+    async def test_stop_keeps_cleanup_stopped(self):
+        """Test that acquiring after stop() doesn't restart the cleanup task."""
+        limiter = RateLimiter()
+        
+        assert await limiter.acquire("user:1")
+        assert limiter._cleanup_task is not None
+        
+        await limiter.stop()
+        assert await limiter.acquire("user:1")
+        assert limiter._cleanup_task is None
+        
+        limiter.start()
+        assert limiter._cleanup_task is not None
+        await limiter.stop()
+    
+    def test_cleanup_restarts_on_new_loop(self):
+        """Test that a limiter reused on a new event loop restarts cleanup there."""
+        limiter = RateLimiter()
+        
+        async def acquire():
+            assert await limiter.acquire("user:1")
+            return limiter._cleanup_task
+        
+        first_task = asyncio.run(acquire())
+        second_task = asyncio.run(acquire())
+        
+        assert second_task is not first_task
+        assert second_task.get_loop() is not first_task.get_loop()
+    
+    @pytest.mark.asyncio
+    async def test_cleanup_skips_buckets_with_waiters(self):
+        """Test that cleanup never drops a bucket someone is waiting on."""
+        limiter = RateLimiter(default_capacity=1, default_refill_rate=0.01, cleanup_interval=60)
+        assert await limiter.acquire("user:1")
+        assert await limiter.acquire("user:2")
+        
+        waiter = asyncio.create_task(limiter.wait_for_tokens("user:1"))
+        await asyncio.sleep(0.01)
+        
+        # Age both buckets past the cutoff
+        for bucket in limiter.buckets.values():
+            bucket.last_access -= 120
+        limiter._cleanup_buckets()
+        
+        assert "user:1" in limiter.buckets
+        assert "user:2" not in limiter.buckets
+        
+        await limiter.reset_bucket("user:1")
+        assert await asyncio.wait_for(waiter, timeout=1)
+        await limiter.stop()
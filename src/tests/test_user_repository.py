@@ -6,8 +6,6 @@ using pytest and asyncio.
 """
 
 import pytest
-import tempfile
-import os
 from datetime import datetime
 from pathlib import Path
 
@@ -20,25 +18,15 @@ class TestUserRepository:
     """Test suite for UserRepository functionality."""
     
     @pytest.fixture
-    async def temp_repo(self):
+    async def temp_repo(self, tmp_path):
         """Create a temporary user repository for testing."""
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-        temp_file.close()
-        
-        # Initialize repository
-        repo = UserRepository(temp_file.name)
+        # Initialize repository in pytest's per-test directory (cleaned up by pytest)
+        repo = UserRepository(str(tmp_path / "users.json"))
         
         # Wait for initialization to complete
         await repo._initialize_file()
         
-        yield repo
-        
-        # Cleanup
-        try:
-            os.unlink(temp_file.name)
-        except FileNotFoundError:
-            pass
+        return repo
     
     @pytest.fixture
     def sample_user_data(self):
@@ -152,6 +140,24 @@ class TestUserRepository:
         assert updated_user.wins == 1
         assert updated_user.get_win_rate() == 50.0
     
+    @pytest.mark.asyncio
+    async def test_add_competition_participations(self, temp_repo, sample_user_data):
+        """Test recording several competition results at once."""
+        # Create user
+        user = await temp_repo.create_user(**sample_user_data)
+        
+        # Record a batch of results
+        updated_user = await temp_repo.add_competition_participations(
+            user.discord_id, [True, False, False, True]
+        )
+        assert updated_user.total_competitions == 4
+        assert updated_user.wins == 2
+        
+        # Verify the batch was persisted
+        stored_user = await temp_repo.get_user_by_discord_id(user.discord_id)
+        assert stored_user.total_competitions == 4
+        assert stored_user.wins == 2
+    
     @pytest.mark.asyncio
     async def test_add_achievement(self, temp_repo, sample_user_data):
         """Test adding achievements to user."""
@@ -189,6 +195,46 @@ class TestUserRepository:
         user_lower = await temp_repo.get_user_by_osrs_username(sample_user_data["osrs_username"].lower())
         assert user_lower is not None
     
+    @pytest.mark.asyncio
+    async def test_osrs_lookup_after_own_write_uses_index(self, temp_repo, sample_user_data, monkeypatch):
+        """Test that lookups after this repository's own writes don't rebuild the index."""
+        rebuilds = []
+        original_rebuild = temp_repo._rebuild_osrs_index
+        
+        def counting_rebuild(data):
+            rebuilds.append(data)
+            original_rebuild(data)
+        
+        monkeypatch.setattr(temp_repo, "_rebuild_osrs_index", counting_rebuild)
+        
+        await temp_repo.create_user(**sample_user_data)
+        user = await temp_repo.get_user_by_osrs_username(sample_user_data["osrs_username"])
+        assert user is not None
+        
+        await temp_repo.link_osrs_account(sample_user_data["discord_id"], "Renamed")
+        assert await temp_repo.get_user_by_osrs_username("renamed") is not None
+        assert await temp_repo.get_user_by_osrs_username(sample_user_data["osrs_username"]) is None
+        
+        assert rebuilds == []
+    
+    @pytest.mark.asyncio
+    async def test_osrs_lookup_sees_other_repository_writes(self, temp_repo, sample_user_data):
+        """Test that a user created through another instance is found and can't be duplicated."""
+        # Prime the index before the other instance writes
+        assert await temp_repo.get_user_by_osrs_username(sample_user_data["osrs_username"]) is None
+        
+        other_repo = UserRepository(str(temp_repo.file_path))
+        await other_repo._initialize_file()
+        await other_repo.create_user(**sample_user_data)
+        
+        user = await temp_repo.get_user_by_osrs_username(sample_user_data["osrs_username"].lower())
+        assert user is not None
+        assert user.discord_id == sample_user_data["discord_id"]
+        
+        await temp_repo.create_user(discord_id=987654321098765432)
+        with pytest.raises(UserError):
+            await temp_repo.link_osrs_account(987654321098765432, sample_user_data["osrs_username"].upper())
+    
     @pytest.mark.asyncio
     async def test_delete_user(self, temp_repo, sample_user_data):
         """Test deleting a user."""
@@ -273,48 +319,36 @@ class TestUserRepository:
 
 # Integration test example
 @pytest.mark.asyncio
-async def test_user_workflow_integration():
+async def test_user_workflow_integration(tmp_path):
     """Integration test for common user workflow."""
     # Create temporary repository
-    temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False)
-    temp_file.close()
+    repo = UserRepository(str(tmp_path / "users.json"))
+    await repo._initialize_file()
     
-    try:
-        repo = UserRepository(temp_file.name)
-        await repo._initialize_file()
-        
-        discord_id = 123456789012345678
-        osrs_username = "IntegrationTest"
-        
-        # 1. Create user without OSRS account
-        user = await repo.create_user(discord_id=discord_id)
-        assert not user.is_osrs_linked()
-        
-        # 2. Link OSRS account
-        user = await repo.link_osrs_account(discord_id, osrs_username)
-        assert user.is_osrs_linked()
-        
-        # 3. Participate in competitions
-        for i in range(5):
-            won = i < 2  # Win first 2 competitions
-            await repo.add_competition_participation(discord_id, won=won)
-        
-        # 4. Add achievements
-        await repo.add_user_achievement(discord_id, "first_win")
-        await repo.add_user_achievement(discord_id, "participation_5")
-        
-        # 5. Verify final state
-        final_user = await repo.get_user_by_discord_id(discord_id)
-        assert final_user.total_competitions == 5
-        assert final_user.wins == 2
-        assert final_user.get_win_rate() == 40.0
-        assert len(final_user.achievements) == 2
-        
-    finally:
-        try:
-            os.unlink(temp_file.name)
-        except FileNotFoundError:
-            pass
+    discord_id = 123456789012345678
+    osrs_username = "IntegrationTest"
+    
+    # 1. Create user without OSRS account
+    user = await repo.create_user(discord_id=discord_id)
+    assert not user.is_osrs_linked()
+    
+    # 2. Link OSRS account
+    user = await repo.link_osrs_account(discord_id, osrs_username)
+    assert user.is_osrs_linked()
+    
+    # 3. Participate in competitions (win first 2)
+    await repo.add_competition_participations(discord_id, [True, True, False, False, False])
+    
+    # 4. Add achievements
+    await repo.add_user_achievement(discord_id, "first_win")
+    await repo.add_user_achievement(discord_id, "participation_5")
+    
+    # 5. Verify final state
+    final_user = await repo.get_user_by_discord_id(discord_id)
+    assert final_user.total_competitions == 5
+    assert final_user.wins == 2
+    assert final_user.get_win_rate() == 40.0
+    assert len(final_user.achievements) == 2
 
 
 if __name__ == "__main__":
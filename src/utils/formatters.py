@@ -5,14 +5,63 @@ Provides consistent formatting for embeds, messages, and data display
 with OSRS-themed styling and responsive layouts.
 """
 
+import time
 import discord
-from typing import List, Dict, Any, Optional, Union
-from datetime import datetime, timedelta
-from math import ceil
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 
 from data.models.competition import Competition, CompetitionStatus
 from data.models.user import User
 from data.models.leaderboard import LeaderboardEntry, Achievement
+from utils.time_utils import iso_to_unix_seconds
+
+
+# Medal emojis for first, second and third place
+_MEDALS = ("🥇", "🥈", "🥉")
+
+
+def _iso_to_unix(timestamp: str) -> int:
+    """Convert a stored ISO-8601 timestamp to whole Unix seconds for Discord timestamps."""
+    return int(iso_to_unix_seconds(timestamp))
+
+
+@lru_cache(maxsize=16384)
+def _discord_ts(timestamp: str, style: str = 'F') -> str:
+    """Render a stored ISO-8601 timestamp as a Discord timestamp tag, e.g. <t:1700000000:F>."""
+    return f"<t:{_iso_to_unix(timestamp)}:{style}>"
+
+
+@lru_cache(maxsize=512)
+def _humanize(identifier: str) -> str:
+    """Turn a snake_case identifier such as an achievement ID into a display label."""
+    return identifier.replace('_', ' ').title()
+
+
+@lru_cache(maxsize=256)
+def _format_examples(examples: Tuple[str, ...]) -> str:
+    """Render a command's usage examples as one code-formatted line each."""
+    return "\n".join([f"`{example}`" for example in examples])
+
+
+class _ColorMap(dict):
+    """Color lookup table that falls back to the "info" color for unknown names."""
+    
+    def __missing__(self, key: str) -> discord.Color:
+        return self["info"]
+
+
+class _StatusTheme:
+    """Pre-resolved emoji, color and display label for one status value."""
+    
+    __slots__ = ('emoji', 'color', 'title', 'display')
+    
+    def __init__(self, emoji: str, color: discord.Color, title: str):
+        self.emoji = emoji
+        self.color = color
+        self.title = title
+        self.display = f"{emoji} {title}"
 
 
 class EmbedFormatter:
@@ -23,8 +72,8 @@ class EmbedFormatter:
     OSRS-themed colors and formatting.
     """
     
-    # Color scheme
-    COLORS = {
+    # Color scheme (unknown names resolve to "info")
+    COLORS = _ColorMap({
         "success": discord.Color.green(),
         "error": discord.Color.red(),
         "warning": discord.Color.orange(),
@@ -36,7 +85,7 @@ class EmbedFormatter:
         "osrs_orange": discord.Color.from_rgb(255, 152, 31),  # OSRS UI orange
         "osrs_yellow": discord.Color.from_rgb(255, 255, 0),   # OSRS text yellow
         "osrs_red": discord.Color.from_rgb(255, 0, 0),        # OSRS red text
-    }
+    })
     
     # Status emojis
     STATUS_EMOJIS = {
@@ -60,12 +109,47 @@ class EmbedFormatter:
         "speedrun": "⏱️",
     }
     
+    # Leaderboard score renderers, keyed by score format
+    SCORE_FORMATTERS = {
+        "wins": lambda score: f"{int(score)} wins",
+        "competitions": lambda score: f"{int(score)} competitions",
+        "percentage": lambda score: f"{score:.1f}%",
+    }
+    
+    # Pre-resolved status styling so embeds don't re-title enum values on every render
+    # (colors are zipped in because the comprehension body can't see class attributes)
+    STATUS_THEMES = {
+        status: _StatusTheme(emoji, color, status.title())
+        for (status, emoji), color in zip(STATUS_EMOJIS.items(),
+                                          map(COLORS.__getitem__, STATUS_EMOJIS))
+    }
+    COMP_TYPE_DISPLAY = {
+        comp_type: _humanize(comp_type) for comp_type in COMPETITION_EMOJIS
+    }
+    
+    @classmethod
+    def get_status_theme(cls, status_value: str) -> _StatusTheme:
+        """
+        Get the display theme for a status value.
+        
+        Args:
+            status_value: Status value, e.g. a CompetitionStatus value
+            
+        Returns:
+            Theme for the status; unknown values get a "❓" theme in the info color
+        """
+        theme = cls.STATUS_THEMES.get(status_value)
+        if theme is None:
+            theme = _StatusTheme("❓", cls.COLORS[status_value], status_value.title())
+        return theme
+    
     @classmethod
     def create_basic_embed(cls, 
                           title: str, 
                           description: str = None,
                           color: Union[str, discord.Color] = "info",
-                          emoji: str = None) -> discord.Embed:
+                          emoji: str = None,
+                          now: Optional[datetime] = None) -> discord.Embed:
         """
         Create a basic embed with consistent styling.
         
@@ -74,16 +158,29 @@ class EmbedFormatter:
             description: Embed description
             color: Color name or discord.Color object
             emoji: Optional emoji for title
+            now: Embed timestamp; pass one value when rendering several embeds
             
         Returns:
             Formatted Discord embed
         """
-        # Get color
         if isinstance(color, str):
-            embed_color = cls.COLORS.get(color, cls.COLORS["info"])
-        else:
-            embed_color = color
-        
+            return cls._create_basic_embed_named_color(title, description, color, emoji, now)
+        return cls._create_basic_embed_raw_color(title, description, color, emoji, now)
+    
+    @classmethod
+    def _create_basic_embed_named_color(cls, title: str, description: Optional[str],
+                                        color_name: str, emoji: Optional[str],
+                                        now: Optional[datetime] = None) -> discord.Embed:
+        """Create a basic embed for a color name from COLORS."""
+        return cls._create_basic_embed_raw_color(
+            title, description, cls.COLORS[color_name], emoji, now
+        )
+    
+    @classmethod
+    def _create_basic_embed_raw_color(cls, title: str, description: Optional[str],
+                                      color: discord.Color, emoji: Optional[str],
+                                      now: Optional[datetime] = None) -> discord.Embed:
+        """Create a basic embed for an already resolved discord.Color."""
         # Format title with emoji
         if emoji:
             formatted_title = f"{emoji} {title}"
@@ -93,50 +190,70 @@ class EmbedFormatter:
         embed = discord.Embed(
             title=formatted_title,
             description=description,
-            color=embed_color,
-            timestamp=datetime.utcnow()
+            color=color,
+            timestamp=now or datetime.utcnow()
         )
         
         return embed
     
     @classmethod
-    def create_success_embed(cls, title: str, description: str = None) -> discord.Embed:
+    def create_success_embed(cls, title: str, description: str = None,
+                             now: Optional[datetime] = None) -> discord.Embed:
         """Create a success embed."""
-        return cls.create_basic_embed(title, description, "success", cls.STATUS_EMOJIS["success"])
+        return cls._create_basic_embed_named_color(
+            title, description, "success", cls.STATUS_EMOJIS["success"], now
+        )
     
     @classmethod
-    def create_error_embed(cls, title: str, description: str = None) -> discord.Embed:
+    def create_error_embed(cls, title: str, description: str = None,
+                           now: Optional[datetime] = None) -> discord.Embed:
         """Create an error embed."""
-        return cls.create_basic_embed(title, description, "error", cls.STATUS_EMOJIS["error"])
+        return cls._create_basic_embed_named_color(
+            title, description, "error", cls.STATUS_EMOJIS["error"], now
+        )
     
     @classmethod
-    def create_warning_embed(cls, title: str, description: str = None) -> discord.Embed:
+    def create_warning_embed(cls, title: str, description: str = None,
+                             now: Optional[datetime] = None) -> discord.Embed:
         """Create a warning embed."""
-        return cls.create_basic_embed(title, description, "warning", cls.STATUS_EMOJIS["warning"])
+        return cls._create_basic_embed_named_color(
+            title, description, "warning", cls.STATUS_EMOJIS["warning"], now
+        )
     
     @classmethod
-    def create_competition_embed(cls, competition: Competition, detailed: bool = False) -> discord.Embed:
+    def create_competition_embed(cls, competition: Competition, detailed: bool = False,
+                                 now: Optional[datetime] = None) -> discord.Embed:
         """
         Create an embed for displaying competition information.
         
+        The compact (list view) embed only carries the summary fields; the
+        description, schedule and winners are included when detailed is set.
+        
         Args:
             competition: Competition object
             detailed: Whether to include detailed information
+            now: Embed timestamp; pass one value when rendering several embeds
             
         Returns:
             Formatted competition embed
         """
-        # Get status color and emoji
-        status_color = cls.COLORS.get(competition.status.value, cls.COLORS["info"])
-        status_emoji = cls.STATUS_EMOJIS.get(competition.status.value, "❓")
-        comp_emoji = cls.COMPETITION_EMOJIS.get(competition.type.value, "📝")
+        if detailed:
+            return cls._create_competition_embed_detailed(competition, now)
+        return cls._create_competition_embed_compact(competition, now)
+    
+    @classmethod
+    def _create_competition_embed_compact(cls, competition: Competition,
+                                          now: Optional[datetime] = None) -> discord.Embed:
+        """Create the list view competition embed with the summary fields."""
+        type_value = competition.type.value
+        comp_emoji = cls.COMPETITION_EMOJIS.get(type_value, "📝")
+        status_theme = cls.get_status_theme(competition.status.value)
         
         # Create embed
         embed = discord.Embed(
             title=f"{comp_emoji} {competition.title}",
-            description=competition.description if detailed else None,
-            color=status_color,
-            timestamp=datetime.utcnow()
+            color=status_theme.color,
+            timestamp=now or datetime.utcnow()
         )
         
         # Basic information
@@ -148,13 +265,13 @@ class EmbedFormatter:
         
         embed.add_field(
             name="Type",
-            value=competition.type.value.replace('_', ' ').title(),
+            value=cls.COMP_TYPE_DISPLAY.get(type_value) or _humanize(type_value),
             inline=True
         )
         
         embed.add_field(
             name="Status",
-            value=f"{status_emoji} {competition.status.value.title()}",
+            value=status_theme.display,
             inline=True
         )
         
@@ -164,54 +281,57 @@ class EmbedFormatter:
             inline=True
         )
         
+        return embed
+    
+    @classmethod
+    def _create_competition_embed_detailed(cls, competition: Competition,
+                                           now: Optional[datetime] = None) -> discord.Embed:
+        """Create the full competition embed with schedule and winners."""
+        embed = cls._create_competition_embed_compact(competition, now)
+        embed.description = competition.description
+        
         # Time information
-        if detailed:
-            start_time = datetime.fromisoformat(competition.start_time.replace('Z', '+00:00'))
-            end_time = datetime.fromisoformat(competition.end_time.replace('Z', '+00:00'))
-            
-            embed.add_field(
-                name="Start Time",
-                value=f"<t:{int(start_time.timestamp())}:F>",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="End Time", 
-                value=f"<t:{int(end_time.timestamp())}:F>",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="Duration",
-                value=f"{competition.get_duration_hours():.0f} hours",
-                inline=True
-            )
+        embed.add_field(
+            name="Start Time",
+            value=_discord_ts(competition.start_time, 'F'),
+            inline=True
+        )
+        
+        embed.add_field(
+            name="End Time", 
+            value=_discord_ts(competition.end_time, 'F'),
+            inline=True
+        )
+        
+        embed.add_field(
+            name="Duration",
+            value=f"{competition.get_duration_hours():.0f} hours",
+            inline=True
+        )
         
         # Winners if completed
         if competition.status == CompetitionStatus.COMPLETED and competition.winners:
-            winner_text = []
-            medals = ["🥇", "🥈", "🥉"]
-            
-            for i, winner_id in enumerate(competition.winners[:3]):
-                medal = medals[i] if i < 3 else f"{i+1}."
-                winner_text.append(f"{medal} <@{winner_id}>")
-            
             embed.add_field(
                 name="🏆 Winners",
-                value="\n".join(winner_text),
+                value="\n".join([
+                    f"{_MEDALS[i]} <@{winner_id}>"
+                    for i, winner_id in enumerate(competition.winners[:3])
+                ]),
                 inline=False
             )
         
         return embed
     
     @classmethod
-    def create_user_profile_embed(cls, user: User, discord_user: discord.User = None) -> discord.Embed:
+    def create_user_profile_embed(cls, user: User, discord_user: discord.User = None,
+                                  now: Optional[datetime] = None) -> discord.Embed:
         """
         Create an embed for displaying user profile.
         
         Args:
             user: User object
             discord_user: Optional Discord user object for avatar
+            now: Embed timestamp; pass one value when rendering several embeds
             
         Returns:
             Formatted user profile embed
@@ -219,7 +339,7 @@ class EmbedFormatter:
         embed = discord.Embed(
             title=f"👤 {discord_user.display_name if discord_user else 'User'}'s Profile",
             color=cls.COLORS["osrs_orange"],
-            timestamp=datetime.utcnow()
+            timestamp=now or datetime.utcnow()
         )
         
         # Set thumbnail if Discord user provided
@@ -239,10 +359,9 @@ class EmbedFormatter:
             inline=True
         )
         
-        join_timestamp = int(datetime.fromisoformat(user.join_date.replace('Z', '+00:00')).timestamp())
         embed.add_field(
             name="Member Since",
-            value=f"<t:{join_timestamp}:D>",
+            value=_discord_ts(user.join_date, 'D'),
             inline=True
         )
         
@@ -263,10 +382,9 @@ class EmbedFormatter:
         )
         
         # Last activity
-        last_activity = int(datetime.fromisoformat(user.last_activity.replace('Z', '+00:00')).timestamp())
         embed.add_field(
             name="🕒 Last Active",
-            value=f"<t:{last_activity}:R>",
+            value=_discord_ts(user.last_activity, 'R'),
             inline=True
         )
         
@@ -278,7 +396,8 @@ class EmbedFormatter:
                                 entries: List[LeaderboardEntry], 
                                 score_format: str = "points",
                                 page: int = 1,
-                                total_pages: int = 1) -> discord.Embed:
+                                total_pages: int = 1,
+                                now: Optional[datetime] = None) -> discord.Embed:
         """
         Create an embed for displaying leaderboard.
         
@@ -288,6 +407,7 @@ class EmbedFormatter:
             score_format: Format for displaying scores
             page: Current page number
             total_pages: Total number of pages
+            now: Embed timestamp; pass one value when rendering several embeds
             
         Returns:
             Formatted leaderboard embed
@@ -295,42 +415,26 @@ class EmbedFormatter:
         embed = discord.Embed(
             title=f"📈 {title}",
             color=cls.COLORS["osrs_yellow"],
-            timestamp=datetime.utcnow()
+            timestamp=now or datetime.utcnow()
         )
         
         if not entries:
             embed.description = "No entries found."
             return embed
         
-        # Rank emojis for top 3
-        rank_emojis = ["🥇", "🥈", "🥉"]
+        # Pick the score renderer once rather than per entry
+        format_score = cls.SCORE_FORMATTERS.get(score_format)
+        if format_score is None:
+            def format_score(score: float) -> str:
+                return f"{score:.1f} {score_format}"
         
-        # Format entries
-        leaderboard_text = []
-        for entry in entries:
-            # Get rank emoji or number
-            if entry.rank <= 3:
-                rank_display = rank_emojis[entry.rank - 1]
-            else:
-                rank_display = f"**{entry.rank}.**"
-            
-            # Format score
-            if score_format == "wins":
-                score_text = f"{int(entry.score)} wins"
-            elif score_format == "competitions":
-                score_text = f"{int(entry.score)} competitions"
-            elif score_format == "percentage":
-                score_text = f"{entry.score:.1f}%"
-            else:
-                score_text = f"{entry.score:.1f} {score_format}"
-            
-            # User display
-            user_display = entry.display_name or f"<@{entry.user_id}>"
-            
-            leaderboard_text.append(f"{rank_display} {user_display} - {score_text}")
-        
-        # Add entries to embed
-        embed.description = "\n".join(leaderboard_text)
+        # Format entries straight into the description, one string per row.
+        # A list (not a generator) is passed because str.join builds one anyway.
+        embed.description = "\n".join([
+            f"{_MEDALS[entry.rank - 1] if entry.rank <= 3 else f'**{entry.rank}.**'} "
+            f"{entry.display_name or f'<@{entry.user_id}>'} - {format_score(entry.score)}"
+            for entry in entries
+        ])
         
         # Add page information if multiple pages
         if total_pages > 1:
@@ -339,13 +443,15 @@ class EmbedFormatter:
         return embed
     
     @classmethod
-    def create_achievement_embed(cls, achievement: Achievement, user_name: str = None) -> discord.Embed:
+    def create_achievement_embed(cls, achievement: Achievement, user_name: str = None,
+                                 now: Optional[datetime] = None) -> discord.Embed:
         """
         Create an embed for displaying achievement.
         
         Args:
             achievement: Achievement object
             user_name: Optional user name
+            now: Embed timestamp; pass one value when rendering several embeds
             
         Returns:
             Formatted achievement embed
@@ -353,12 +459,12 @@ class EmbedFormatter:
         embed = discord.Embed(
             title="🏆 Achievement Unlocked!",
             color=cls.COLORS["osrs_yellow"],
-            timestamp=datetime.utcnow()
+            timestamp=now or datetime.utcnow()
         )
         
         embed.add_field(
             name="Achievement",
-            value=achievement.achievement_id.replace('_', ' ').title(),
+            value=_humanize(achievement.achievement_id),
             inline=False
         )
         
@@ -369,10 +475,9 @@ class EmbedFormatter:
                 inline=True
             )
         
-        earned_timestamp = int(datetime.fromisoformat(achievement.earned_date.replace('Z', '+00:00')).timestamp())
         embed.add_field(
             name="Earned",
-            value=f"<t:{earned_timestamp}:F>",
+            value=_discord_ts(achievement.earned_date, 'F'),
             inline=True
         )
         
@@ -388,31 +493,48 @@ class EmbedFormatter:
     @classmethod
     def create_paginated_embed(cls,
                               title: str,
-                              items: List[str],
+                              items: Iterable[str],
                               items_per_page: int = 10,
                               page: int = 1,
-                              color: Union[str, discord.Color] = "info") -> discord.Embed:
+                              color: Union[str, discord.Color] = "info",
+                              now: Optional[datetime] = None,
+                              total: Optional[int] = None) -> discord.Embed:
         """
         Create a paginated embed for large lists.
         
         Args:
             title: Embed title
-            items: List of items to display
+            items: Items to display; any iterable, only the current page is consumed
             items_per_page: Number of items per page
             page: Current page (1-indexed)
             color: Embed color
+            now: Embed timestamp; pass one value when rendering several embeds
+            total: Total number of items; pass it to avoid materializing
+                iterables that have no len()
             
         Returns:
             Formatted paginated embed
         """
-        total_pages = ceil(len(items) / items_per_page)
+        if total is None:
+            if not hasattr(items, "__len__"):
+                items = list(items)
+            total = len(items)
+        
+        total_pages = -(-total // items_per_page)
         start_idx = (page - 1) * items_per_page
-        end_idx = start_idx + items_per_page
-        page_items = items[start_idx:end_idx]
+        if isinstance(items, Sequence):
+            if total_pages <= 1 and page == 1:
+                # Everything fits on the first page; no need to copy the list
+                page_items = items
+            else:
+                page_items = items[start_idx:start_idx + items_per_page]
+        else:
+            page_items = list(islice(items, start_idx, start_idx + items_per_page))
         
         embed = cls.create_basic_embed(
             title=f"{title} (Page {page}/{total_pages})",
-            color=color
+            color=color,
+            now=now
         )
         
         if page_items:
@@ -421,13 +543,14 @@ class EmbedFormatter:
             embed.description = "No items found."
         
         if total_pages > 1:
-            embed.set_footer(text=f"Page {page} of {total_pages} | {len(items)} total items")
+            embed.set_footer(text=f"Page {page} of {total_pages} | {total} total items")
         
         return embed
     
     @classmethod
     def create_help_embed(cls, command_name: str, description: str, 
-                         usage: str = None, examples: List[str] = None) -> discord.Embed:
+                         usage: str = None, examples: List[str] = None,
+                         now: Optional[datetime] = None) -> discord.Embed:
         """
         Create a help embed for commands.
         
@@ -436,14 +559,13 @@ class EmbedFormatter:
             description: Command description
             usage: Usage syntax
             examples: List of usage examples
+            now: Embed timestamp; pass one value when rendering several embeds
             
         Returns:
             Formatted help embed
         """
-        embed = cls.create_basic_embed(
-            title=f"📚 Help: {command_name}",
-            description=description,
-            color="info"
+        embed = cls._create_basic_embed_named_color(
+            f"📚 Help: {command_name}", description, "info", None, now
         )
         
         if usage:
@@ -454,10 +576,9 @@ class EmbedFormatter:
             )
         
         if examples:
-            example_text = "\n".join([f"`{example}`" for example in examples])
             embed.add_field(
                 name="Examples",
-                value=example_text,
+                value=_format_examples(tuple(examples)),
                 inline=False
             )
         
@@ -485,10 +606,16 @@ class MessageFormatter:
         if seconds <= 0:
             return "Ended"
         
-        time_delta = timedelta(seconds=int(seconds))
-        days = time_delta.days
-        hours, remainder = divmod(time_delta.seconds, 3600)
-        minutes, _ = divmod(remainder, 60)
+        # Fast paths for the common "minutes left" cases
+        total_seconds = int(seconds)
+        if total_seconds < 60:
+            return "Less than 1 minute"
+        if total_seconds < 3600:
+            return f"{total_seconds // 60}m"
+        
+        days, remainder = divmod(total_seconds, 86400)
+        hours, remainder = divmod(remainder, 3600)
+        minutes = remainder // 60
         
         parts = []
         if days > 0:
@@ -569,19 +696,17 @@ class MessageFormatter:
         Returns:
             Formatted status string
         """
-        status_emoji = EmbedFormatter.STATUS_EMOJIS.get(competition.status.value, "❓")
-        status_text = competition.status.value.title()
+        status_display = EmbedFormatter.get_status_theme(competition.status.value).display
         
         if competition.status == CompetitionStatus.PENDING:
-            start_time = datetime.fromisoformat(competition.start_time.replace('Z', '+00:00'))
-            time_until_start = (start_time - datetime.utcnow()).total_seconds()
+            time_until_start = competition.start_time_epoch - time.time()
             time_str = MessageFormatter.format_time_remaining(time_until_start)
-            return f"{status_emoji} {status_text} (starts in {time_str})"
+            return f"{status_display} (starts in {time_str})"
         
         elif competition.status == CompetitionStatus.ACTIVE:
             time_remaining = competition.get_time_remaining_hours()
             if time_remaining is not None:
                 time_str = MessageFormatter.format_time_remaining(time_remaining * 3600)
-                return f"{status_emoji} {status_text} ({time_str} remaining)"
+                return f"{status_display} ({time_str} remaining)"
         
-        return f"{status_emoji} {status_text}"
\ No newline at end of file
+        return status_display
\ No newline at end of file
@@ -6,16 +6,17 @@ configurable rates and burst allowances.
 """
 
 import asyncio
+import fnmatch
+import random
+import re
 import time
-from typing import Dict, Optional, Any
+from typing import Deque, Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, field
-from collections import defaultdict
+from collections import OrderedDict, deque
 
 from config.logging_config import LoggerMixin
 
 
-@dataclass
 class RateLimitBucket:
     """
     Token bucket for rate limiting.
@@ -23,65 +24,109 @@ class RateLimitBucket:
     Implements a token bucket algorithm where tokens are added
     at a constant rate and consumed when making requests.
     """
-    capacity: int
-    refill_rate: float  # tokens per second
-    tokens: float = 0.0
-    last_refill: float = field(default_factory=time.time)
     
-    def __post_init__(self):
-        """Initialize bucket with full capacity."""
-        if self.tokens == 0.0:
-            self.tokens = float(self.capacity)
+    # Slotted to keep per-bucket memory small; dataclass(slots=True) needs Python 3.10
+    __slots__ = ("capacity", "refill_rate", "tokens", "last_refill", "paused_until", "last_access")
     
-    def _refill(self) -> None:
-        """Refill tokens based on elapsed time."""
-        now = time.time()
-        elapsed = now - self.last_refill
+    def __init__(self,
+                 capacity: int,
+                 refill_rate: float,
+                 tokens: float = 0.0,
+                 last_refill: Optional[float] = None,
+                 paused_until: float = 0.0,
+                 last_access: Optional[float] = None):
+        """
+        Initialize bucket, with full capacity unless tokens is given.
         
-        # Add tokens based on elapsed time
-        tokens_to_add = elapsed * self.refill_rate
-        self.tokens = min(self.capacity, self.tokens + tokens_to_add)
+        Args:
+            capacity: Maximum number of tokens
+            refill_rate: Tokens added per second
+            tokens: Initial token count (0.0 means full)
+            last_refill: time.monotonic() of the last refill (defaults to now)
+            paused_until: No refills before this time (e.g. API Retry-After)
+            last_access: time.monotonic() of the last successful consume
+                (defaults to last_refill); used to evict unused buckets
+        """
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = tokens if tokens != 0.0 else float(capacity)
+        self.last_refill = time.monotonic() if last_refill is None else last_refill
+        self.paused_until = paused_until
+        self.last_access = self.last_refill if last_access is None else last_access
+    
+    def __repr__(self) -> str:
+        """Detailed string representation of the bucket."""
+        return (f"RateLimitBucket(capacity={self.capacity}, refill_rate={self.refill_rate}, "
+                f"tokens={self.tokens}, last_refill={self.last_refill}, "
+                f"paused_until={self.paused_until}, last_access={self.last_access})")
+    
+    def _refill(self, now: Optional[float] = None) -> None:
+        """Refill tokens based on elapsed time."""
+        if now is None:
+            now = time.monotonic()
+        self.tokens = self.peek_tokens(now)
         self.last_refill = now
     
-    def consume(self, tokens: int = 1) -> bool:
+    def consume(self, tokens: int = 1, now: Optional[float] = None) -> bool:
         """
         Attempt to consume tokens from the bucket.
         
         Args:
             tokens: Number of tokens to consume
+            now: Current time.monotonic() value, if the caller already has one
             
         Returns:
             True if tokens were successfully consumed
         """
-        self._refill()
+        if now is None:
+            now = time.monotonic()
+        self._refill(now)
         
         if self.tokens >= tokens:
             self.tokens -= tokens
+            self.last_access = now
             return True
         
         return False
     
-    def time_until_available(self, tokens: int = 1) -> float:
+    def time_until_available(self, tokens: int = 1, now: Optional[float] = None) -> float:
         """
         Calculate time until requested tokens are available.
         
         Args:
             tokens: Number of tokens needed
+            now: Current time.monotonic() value, if the caller already has one
             
         Returns:
             Time in seconds until tokens are available
         """
-        self._refill()
-        
-        if self.tokens >= tokens:
+        if now is None:
+            now = time.monotonic()
+        self._refill(now)
+        return self.peek_wait(tokens, now)
+    
+    def peek_wait(self, tokens: int, now: float) -> float:
+        """Get the time until tokens are available as of now without updating the bucket."""
+        available = self.peek_tokens(now)
+        pause_remaining = self.paused_until - now
+        if available >= tokens and pause_remaining <= 0:
             return 0.0
         
-        tokens_needed = tokens - self.tokens
-        return tokens_needed / self.refill_rate
+        # Refills only start once the pause ends, so the two waits add up
+        return max(pause_remaining, 0.0) + max(tokens - available, 0.0) / self.refill_rate
     
-    def get_remaining_tokens(self) -> float:
+    def peek_tokens(self, now: float) -> float:
+        """Get the token count as of now without updating the bucket."""
+        if now < self.paused_until:
+            return self.tokens
+        
+        # Tokens only accrue from the end of a pause
+        elapsed = now - max(self.last_refill, self.paused_until)
+        return min(self.capacity, self.tokens + elapsed * self.refill_rate)
+    
+    def get_remaining_tokens(self, now: Optional[float] = None) -> float:
         """Get number of remaining tokens."""
-        self._refill()
+        self._refill(now)
         return self.tokens
 
 
@@ -93,10 +138,17 @@ class RateLimiter(LoggerMixin):
     with configurable rates and burst allowances.
     """
     
+    # Maximum number of key -> config resolutions remembered
+    CONFIG_CACHE_SIZE = 4096
+    
+    # Shortest sleep between wait_for_tokens attempts (seconds)
+    MIN_WAIT = 0.001
+    
     def __init__(self, 
                  default_capacity: int = 10,
                  default_refill_rate: float = 1.0,
-                 cleanup_interval: int = 3600):
+                 cleanup_interval: int = 3600,
+                 max_buckets: int = 10000):
         """
         Initialize rate limiter.
         
@@ -104,14 +156,28 @@ class RateLimiter(LoggerMixin):
             default_capacity: Default bucket capacity
             default_refill_rate: Default refill rate (tokens per second)
             cleanup_interval: Interval to cleanup old buckets (seconds)
+            max_buckets: Maximum number of buckets kept; least recently used are evicted,
+                except buckets with waiters, which can briefly push the count over
         """
         self.default_capacity = default_capacity
         self.default_refill_rate = default_refill_rate
         self.cleanup_interval = cleanup_interval
-        self.buckets: Dict[str, RateLimitBucket] = {}
+        self.max_buckets = max_buckets
+        # Least recently used first
+        self.buckets: "OrderedDict[str, RateLimitBucket]" = OrderedDict()
         self.bucket_configs: Dict[str, Dict[str, Any]] = {}
-        self.last_cleanup = time.time()
-        self._lock = asyncio.Lock()
+        self._compiled_patterns: List[Tuple[re.Pattern, Dict[str, Any]]] = []
+        self._resolved_config_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.last_cleanup = time.monotonic()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        # Set by stop() so the next acquire doesn't lazily restart the cleanup task
+        self._cleanup_stopped = False
+        # One lock per bucket so unrelated keys never contend; waiters park on it
+        # (as a condition) until tokens may be available
+        self._bucket_locks: Dict[str, asyncio.Condition] = {}
+        # Keys with wait_for_tokens callers in flight -> how many; these keys are
+        # never evicted, so every waiter and notifier share one condition
+        self._bucket_waiters: Dict[str, int] = {}
     
     def configure_bucket(self, key_pattern: str, capacity: int, refill_rate: float) -> None:
         """
@@ -122,43 +188,121 @@ class RateLimiter(LoggerMixin):
             capacity: Bucket capacity
             refill_rate: Refill rate (tokens per second)
         """
-        self.bucket_configs[key_pattern] = {
+        config = {
             "capacity": capacity,
             "refill_rate": refill_rate
         }
+        self.bucket_configs[key_pattern] = config
+        
+        if "*" in key_pattern:
+            # Compiled the same way fnmatch.fnmatchcase does, most specific
+            # (most literal characters) first so it wins over broader patterns
+            wildcard_patterns = sorted(
+                (pattern for pattern in self.bucket_configs if "*" in pattern),
+                key=lambda pattern: -len(pattern.replace("*", ""))
+            )
+            self._compiled_patterns = [
+                (re.compile(fnmatch.translate(pattern)), self.bucket_configs[pattern])
+                for pattern in wildcard_patterns
+            ]
+        
+        # Earlier resolutions may now map to a different config
+        self._resolved_config_cache.clear()
         
         self.logger.info(f"Configured rate limit: {key_pattern} -> {capacity} tokens, {refill_rate}/s")
     
     def _get_bucket_config(self, key: str) -> Dict[str, Any]:
         """Get bucket configuration for a key."""
-        # Check for exact matches first
-        if key in self.bucket_configs:
-            return self.bucket_configs[key]
-        
-        # Check for pattern matches
-        for pattern, config in self.bucket_configs.items():
-            if "*" in pattern:
-                # Simple wildcard matching
-                pattern_parts = pattern.split("*")
-                if all(part in key for part in pattern_parts if part):
-                    return config
-        
-        # Return default configuration
-        return {
-            "capacity": self.default_capacity,
-            "refill_rate": self.default_refill_rate
-        }
+        cache = self._resolved_config_cache
+        config = cache.get(key)
+        if config is not None:
+            cache.move_to_end(key)
+            return config
+        
+        # Check for exact matches first, then wildcard patterns
+        config = self.bucket_configs.get(key)
+        if config is None:
+            for pattern, pattern_config in self._compiled_patterns:
+                if pattern.match(key):
+                    config = pattern_config
+                    break
+            else:
+                # Fall back to the default configuration
+                config = {
+                    "capacity": self.default_capacity,
+                    "refill_rate": self.default_refill_rate
+                }
+        
+        cache[key] = config
+        if len(cache) > self.CONFIG_CACHE_SIZE:
+            cache.popitem(last=False)
+        
+        return config
     
-    def _get_bucket(self, key: str) -> RateLimitBucket:
-        """Get or create bucket for a key."""
-        if key not in self.buckets:
-            config = self._get_bucket_config(key)
-            self.buckets[key] = RateLimitBucket(
-                capacity=config["capacity"],
-                refill_rate=config["refill_rate"]
-            )
-        
-        return self.buckets[key]
+    def _get_bucket(self, key: str, now: Optional[float] = None) -> RateLimitBucket:
+        """Get or create bucket for a key, starting new buckets' refill clock at now."""
+        bucket = self.buckets.get(key)
+        if bucket is not None:
+            self.buckets.move_to_end(key)
+            return bucket
+        
+        if len(self.buckets) >= self.max_buckets:
+            self._evict_bucket()
+        
+        config = self._get_bucket_config(key)
+        bucket = self.buckets[key] = RateLimitBucket(
+            capacity=config["capacity"],
+            refill_rate=config["refill_rate"],
+            last_refill=now
+        )
+        return bucket
+    
+    def _evict_bucket(self) -> None:
+        """Evict the least recently used bucket that has no waiters."""
+        for key in self.buckets:
+            if not self._bucket_waiters.get(key):
+                del self.buckets[key]
+                self._bucket_locks.pop(key, None)
+                return
+    
+    def start(self) -> None:
+        """Start the background task that cleans up unused buckets."""
+        self._cleanup_stopped = False
+        self._ensure_cleanup_task()
+    
+    def _ensure_cleanup_task(self) -> None:
+        """Start the cleanup task on the running loop unless stop() was called."""
+        if self._cleanup_stopped:
+            return
+        task = self._cleanup_task
+        if task is not None and not task.done():
+            loop = asyncio.get_running_loop()
+            if task.get_loop() is loop:
+                return
+            # Reused on a new event loop: the old task, conditions and waiter
+            # counts belong to the previous loop and can never run or finish
+            self._bucket_locks.clear()
+            self._bucket_waiters.clear()
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+    
+    async def stop(self) -> None:
+        """Stop the background cleanup task until start() is called again."""
+        self._cleanup_stopped = True
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
+    
+    def _get_bucket_lock(self, key: str) -> asyncio.Condition:
+        """Get or create the lock guarding the bucket for a key."""
+        # No await between lookup and insert, so this can't race on the event loop
+        lock = self._bucket_locks.get(key)
+        if lock is None:
+            lock = self._bucket_locks[key] = asyncio.Condition()
+        return lock
     
     async def acquire(self, key: str, tokens: int = 1) -> bool:
         """
@@ -171,10 +315,42 @@ class RateLimiter(LoggerMixin):
         Returns:
             True if tokens were acquired successfully
         """
-        async with self._lock:
-            await self._cleanup_if_needed()
-            bucket = self._get_bucket(key)
-            return bucket.consume(tokens)
+        self._ensure_cleanup_task()
+        async with self._get_bucket_lock(key):
+            # The loop clock is time.monotonic() (or uvloop's cached equivalent)
+            now = asyncio.get_running_loop().time()
+            return self._get_bucket(key, now).consume(tokens, now)
+    
+    async def acquire_many(self, key: str, count: int) -> float:
+        """
+        Attempt to acquire several tokens for a key in one step.
+        
+        Intended for batched API calls: callers that get a delay back can
+        sleep for it and retry, instead of acquiring one token per call.
+        
+        Args:
+            key: Rate limit key
+            count: Number of tokens to acquire
+            
+        Returns:
+            0.0 if the tokens were acquired, otherwise seconds until they
+            should be available
+            
+        Raises:
+            ValueError: If count exceeds the bucket's capacity, since the
+                bucket can never hold that many tokens
+        """
+        self._ensure_cleanup_task()
+        async with self._get_bucket_lock(key):
+            now = asyncio.get_running_loop().time()
+            bucket = self._get_bucket(key, now)
+            if count > bucket.capacity:
+                raise ValueError(
+                    f"Cannot acquire {count} tokens for {key}: bucket capacity is {bucket.capacity}"
+                )
+            if bucket.consume(count, now):
+                return 0.0
+            return bucket.time_until_available(count, now)
     
     async def wait_for_tokens(self, key: str, tokens: int = 1, timeout: Optional[float] = None) -> bool:
         """
@@ -188,23 +364,45 @@ class RateLimiter(LoggerMixin):
         Returns:
             True if tokens were acquired, False if timeout occurred
         """
-        start_time = time.time()
-        
-        while True:
-            if await self.acquire(key, tokens):
-                return True
-            
-            # Check timeout
-            if timeout and (time.time() - start_time) >= timeout:
-                return False
-            
-            # Calculate wait time
-            async with self._lock:
-                bucket = self._get_bucket(key)
-                wait_time = bucket.time_until_available(tokens)
-            
-            # Wait for a short time or until tokens are available
-            await asyncio.sleep(min(wait_time, 0.1))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout if timeout else None
+        
+        self._ensure_cleanup_task()
+        lock = self._get_bucket_lock(key)
+        self._bucket_waiters[key] = self._bucket_waiters.get(key, 0) + 1
+        try:
+            async with lock:
+                while True:
+                    now = loop.time()
+                    bucket = self._get_bucket(key, now)
+                    if bucket.consume(tokens, now):
+                        # Waiters are woken one at a time; pass on any tokens left over
+                        if bucket.tokens >= 1:
+                            lock.notify(1)
+                        return True
+                    
+                    # Sleep until the tokens should be available or the bucket is reset.
+                    # The floor stops float rounding from spinning on ~0s waits, and the
+                    # jitter (up to a tenth of a token's refill time) keeps waiters that
+                    # computed the same wait from all retrying in the same tick
+                    wait_time = max(bucket.time_until_available(tokens, now), self.MIN_WAIT)
+                    wait_time += random.uniform(0, 0.1 / bucket.refill_rate)
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0:
+                            return False
+                        wait_time = min(wait_time, remaining)
+                    
+                    try:
+                        await asyncio.wait_for(lock.wait(), timeout=wait_time)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            remaining_waiters = self._bucket_waiters[key] - 1
+            if remaining_waiters:
+                self._bucket_waiters[key] = remaining_waiters
+            else:
+                del self._bucket_waiters[key]
     
     async def get_status(self, key: str) -> Dict[str, Any]:
         """
@@ -216,43 +414,73 @@ class RateLimiter(LoggerMixin):
         Returns:
             Dictionary with rate limit status
         """
-        async with self._lock:
-            bucket = self._get_bucket(key)
-            
+        # Read-only snapshot without taking the bucket lock; it may be slightly
+        # stale if an acquire is in flight, which is fine for status reporting
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            config = self._get_bucket_config(key)
             return {
                 "key": key,
-                "remaining_tokens": bucket.get_remaining_tokens(),
-                "capacity": bucket.capacity,
-                "refill_rate": bucket.refill_rate,
-                "time_until_refill": bucket.time_until_available(1) if bucket.tokens < 1 else 0.0
+                "remaining_tokens": float(config["capacity"]),
+                "capacity": config["capacity"],
+                "refill_rate": config["refill_rate"],
+                "time_until_refill": 0.0
             }
+        
+        now = asyncio.get_running_loop().time()
+        return {
+            "key": key,
+            "remaining_tokens": bucket.peek_tokens(now),
+            "capacity": bucket.capacity,
+            "refill_rate": bucket.refill_rate,
+            "time_until_refill": bucket.peek_wait(1, now)
+        }
     
     async def reset_bucket(self, key: str) -> None:
         """Reset bucket for a key (refill to capacity)."""
-        async with self._lock:
+        if key not in self.buckets:
+            return
+        
+        lock = self._get_bucket_lock(key)
+        async with lock:
             if key in self.buckets:
                 bucket = self.buckets[key]
                 bucket.tokens = float(bucket.capacity)
-                bucket.last_refill = time.time()
+                bucket.last_refill = asyncio.get_running_loop().time()
+                bucket.paused_until = 0.0
+                # Each woken waiter wakes the next while tokens remain
+                lock.notify(1)
                 
                 self.logger.info(f"Reset rate limit bucket: {key}")
     
-    async def _cleanup_if_needed(self) -> None:
+    async def _cleanup_loop(self) -> None:
+        """Periodically clean up unused buckets, off the request path."""
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                self._cleanup_buckets()
+            except Exception as e:
+                self.logger.error(f"Rate limit bucket cleanup failed: {e}", exc_info=True)
+    
+    def _cleanup_buckets(self) -> None:
         """Clean up old, unused buckets."""
-        now = time.time()
-        if now - self.last_cleanup < self.cleanup_interval:
-            return
+        # Same clock as the last_access stamps written by acquire
+        now = asyncio.get_running_loop().time()
         
         # Remove buckets that haven't been used recently
         cutoff_time = now - self.cleanup_interval
         keys_to_remove = []
         
         for key, bucket in self.buckets.items():
-            if bucket.last_refill < cutoff_time:
+            lock = self._bucket_locks.get(key)
+            # Leave buckets alone while someone holds their lock or waits on it
+            if (bucket.last_access < cutoff_time and not (lock and lock.locked())
+                    and not self._bucket_waiters.get(key)):
                 keys_to_remove.append(key)
         
         for key in keys_to_remove:
             del self.buckets[key]
+            self._bucket_locks.pop(key, None)
         
         self.last_cleanup = now
         
@@ -294,10 +522,14 @@ class APIRateLimiter(RateLimiter):
                 # Pause rate limiting for the specified time
                 retry_seconds = int(retry_after)
                 
-                async with self._lock:
-                    bucket = self._get_bucket(key)
+                lock = self._get_bucket_lock(key)
+                async with lock:
+                    now = asyncio.get_running_loop().time()
+                    bucket = self._get_bucket(key, now)
                     bucket.tokens = 0.0  # Drain bucket
-                    bucket.last_refill = time.time() + retry_seconds
+                    bucket.paused_until = now + retry_seconds
+                    # Let waiters recompute their wait against the pause
+                    lock.notify_all()
                 
                 self.logger.warning(
                     f"API rate limited for {key}, pausing for {retry_seconds} seconds",
@@ -320,7 +552,7 @@ class APIRateLimiter(RateLimiter):
             await asyncio.sleep(0.5)
             
             # Temporarily reduce rate for this key
-            async with self._lock:
+            async with self._get_bucket_lock(key):
                 bucket = self._get_bucket(key)
                 if bucket.refill_rate > 0.1:
                     bucket.refill_rate *= 0.8  # Reduce rate by 20%
@@ -335,20 +567,30 @@ class CommandRateLimiter:
     """
     Simple rate limiter for Discord commands.
     
-    Tracks command usage per user with sliding window approach.
+    Tracks command usage per user with a sliding window made of
+    WINDOW_SLOTS fixed-width counters, so each check touches at most
+    that many entries however busy the user is.
     """
     
-    def __init__(self, default_limit: int = 5, window_seconds: int = 60):
+    # Number of counters the window is divided into
+    WINDOW_SLOTS = 10
+    
+    def __init__(self, default_limit: int = 5, window_seconds: int = 60,
+                 max_users: int = 10000):
         """
         Initialize command rate limiter.
         
         Args:
             default_limit: Default number of commands per window
             window_seconds: Time window in seconds
+            max_users: Maximum number of users tracked; least recently active are evicted
         """
         self.default_limit = default_limit
         self.window_seconds = window_seconds
-        self.user_commands: Dict[int, List[float]] = defaultdict(list)
+        self.max_users = max_users
+        self._slot_width = window_seconds / self.WINDOW_SLOTS
+        # Per-user (slot, command count) pairs (oldest first), least recently active user first
+        self.user_commands: "OrderedDict[int, Deque[Tuple[int, int]]]" = OrderedDict()
         self.custom_limits: Dict[str, int] = {}
     
     def set_command_limit(self, command_name: str, limit: int) -> None:
@@ -366,38 +608,47 @@ class CommandRateLimiter:
         Returns:
             True if command is allowed
         """
-        now = time.time()
-        cutoff = now - self.window_seconds
+        slot = int(time.time() / self._slot_width)
+        
+        counters = self.user_commands.get(user_id)
+        if counters is None:
+            if len(self.user_commands) >= self.max_users:
+                self.user_commands.popitem(last=False)
+            counters = self.user_commands[user_id] = deque()
+        else:
+            self.user_commands.move_to_end(user_id)
         
-        # Clean up old timestamps
-        self.user_commands[user_id] = [
-            timestamp for timestamp in self.user_commands[user_id]
-            if timestamp > cutoff
-        ]
+        # Drop counters that have left the window
+        oldest_slot = slot - self.WINDOW_SLOTS
+        while counters and counters[0][0] <= oldest_slot:
+            counters.popleft()
         
         # Get limit for this command
         limit = self.custom_limits.get(command_name, self.default_limit)
         
         # Check if under limit
-        if len(self.user_commands[user_id]) < limit:
-            self.user_commands[user_id].append(now)
+        if sum(count for _, count in counters) < limit:
+            if counters and counters[-1][0] == slot:
+                counters[-1] = (slot, counters[-1][1] + 1)
+            else:
+                counters.append((slot, 1))
             return True
         
         return False
     
     def get_reset_time(self, user_id: int) -> float:
         """Get time until rate limit resets for user."""
-        if user_id not in self.user_commands or not self.user_commands[user_id]:
+        counters = self.user_commands.get(user_id)
+        if not counters:
             return 0.0
         
-        oldest_timestamp = min(self.user_commands[user_id])
-        reset_time = oldest_timestamp + self.window_seconds
+        # The oldest counter leaves the window WINDOW_SLOTS slots after it started
+        reset_time = (counters[0][0] + self.WINDOW_SLOTS) * self._slot_width
         return max(0.0, reset_time - time.time())
     
     def reset_user(self, user_id: int) -> None:
         """Reset rate limit for a user."""
-        if user_id in self.user_commands:
-            del self.user_commands[user_id]
+        self.user_commands.pop(user_id, None)
 
 
 # Global instances for easy access
@@ -0,0 +1,64 @@
+"""
+Time parsing utilities for OSRS Discord Bot.
+
+Provides a shared, cached parser for the ISO-8601 timestamps stored
+in the JSON data files and accepted from user input.
+"""
+
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing 'Z' for UTC natively from Python 3.11
+    _fromisoformat = datetime.fromisoformat
+else:
+    def _fromisoformat(timestamp: str) -> datetime:
+        """Parse an ISO-8601 timestamp, accepting a trailing 'Z' for UTC."""
+        if timestamp.endswith('Z'):
+            return datetime.fromisoformat(timestamp[:-1] + '+00:00')
+        return datetime.fromisoformat(timestamp)
+
+
+@lru_cache(maxsize=1024)
+def parse_iso_timestamp(timestamp: str) -> datetime:
+    """
+    Parse an ISO-8601 timestamp, accepting a trailing 'Z' for UTC.
+    
+    Results are cached; datetime objects are immutable, so sharing them
+    between callers is safe.
+    
+    Args:
+        timestamp: Timestamp string to parse
+    
+    Returns:
+        Parsed datetime object
+    
+    Raises:
+        ValueError: If the timestamp format is invalid
+    """
+    return _fromisoformat(timestamp)
+
+
+@lru_cache(maxsize=8192)
+def iso_to_unix_seconds(timestamp: str) -> float:
+    """
+    Convert a stored ISO-8601 timestamp to Unix seconds.
+    
+    Stored timestamps are UTC, so one without an offset is treated as UTC
+    rather than local time.
+    
+    Args:
+        timestamp: Timestamp string to convert
+    
+    Returns:
+        Seconds since the Unix epoch
+    
+    Raises:
+        ValueError: If the timestamp format is invalid
+    """
+    parsed = parse_iso_timestamp(timestamp)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
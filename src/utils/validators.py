@@ -8,11 +8,152 @@ security-focused sanitization.
 
 import re
 import html
-from typing import Any, Optional, Union, List, Dict
+from functools import lru_cache
+from typing import Any, Callable, Optional, Union, List, Dict, Tuple
 from datetime import datetime, timedelta
-from urllib.parse import urlparse
 
 from core.exceptions import ValidationError
+from utils.time_utils import parse_iso_timestamp
+
+# OSRS skills list
+_VALID_SKILLS = frozenset({
+    'attack', 'defence', 'strength', 'hitpoints', 'ranged', 'prayer',
+    'magic', 'cooking', 'woodcutting', 'fletching', 'fishing', 'firemaking',
+    'crafting', 'smithing', 'mining', 'herblore', 'agility', 'thieving',
+    'slayer', 'farming', 'runecrafting', 'hunter', 'construction'
+})
+
+# Common OSRS bosses (not exhaustive, can be expanded)
+_VALID_BOSSES = frozenset({
+    'zulrah', 'vorkath', 'alchemical hydra', 'cerberus', 'kraken',
+    'abyssal sire', 'grotesque guardians', 'thermonuclear smoke devil',
+    'chaos elemental', 'crazy archaeologist', 'scorpia', 'venenatis',
+    'callisto', 'vet\'ion', 'chaos fanatic', 'king black dragon',
+    'giant mole', 'deranged archaeologist', 'sarachnis', 'tempoross',
+    'wintertodt', 'zalcano', 'gauntlet', 'corrupted gauntlet',
+    'theatre of blood', 'chambers of xeric', 'tombs of amascut'
+})
+
+# Integer coercion keyed by exact input type; other types fall back to int().
+# bool maps to None so True/False are rejected instead of passing as 1/0.
+_INT_COERCIONS: Dict[type, Optional[Callable[[Any], int]]] = {
+    bool: None,
+    int: lambda value: value,
+    str: lambda value: int(value.strip()),
+}
+
+# Durations may be given as fractional hours, which are truncated
+_DURATION_COERCIONS: Dict[type, Optional[Callable[[Any], int]]] = {
+    **_INT_COERCIONS,
+    str: lambda value: int(float(value.strip())),
+}
+
+
+@lru_cache(maxsize=128)
+def _lower_choices(choices: Tuple[str, ...]) -> Dict[str, str]:
+    """
+    Map lowercased choices back to their original spelling.
+    
+    Args:
+        choices: Allowed choices
+        
+    Returns:
+        Dictionary of lowercased choice to the first choice with that spelling
+    """
+    lookup: Dict[str, str] = {}
+    for choice in choices:
+        lookup.setdefault(choice.lower(), choice)
+    return lookup
+
+
+def _split_scheme_host(url: str) -> Tuple[str, str]:
+    """
+    Split a URL into its lowercased scheme and its network location.
+    
+    Args:
+        url: URL to split
+        
+    Returns:
+        Tuple of (scheme, netloc); both are empty if the URL has no "://"
+    """
+    # urlsplit drops these before parsing, so a host cannot hide behind them
+    if '\t' in url or '\r' in url or '\n' in url:
+        url = url.replace('\t', '').replace('\r', '').replace('\n', '')
+    
+    idx = url.find('://')
+    if idx < 0:
+        return '', ''
+    
+    rest = url[idx + 3:]
+    end = len(rest)
+    for delimiter in '/?#':
+        pos = rest.find(delimiter, 0, end)
+        if pos >= 0:
+            end = pos
+    
+    return url[:idx].lower(), rest[:end]
+
+
+@lru_cache(maxsize=1)
+def _malicious_pattern() -> re.Pattern:
+    """
+    Build the malicious-content regex on first use.
+    
+    Common SQL injection and XSS patterns are combined so input is scanned once.
+    
+    Returns:
+        Compiled pattern matching SQL injection and XSS fragments
+    """
+    return re.compile(
+        '|'.join([
+            # SQL injection
+            r'\b(?:union|select|insert|update|delete|drop|create|alter|exec|execute)\b',
+            r'[;\'"\\]',
+            r'--',
+            r'/\*|\*/',
+            # XSS
+            r'<script[^>]*>.*?</script>',
+            r'javascript:',
+            r'on\w+\s*=',
+            r'<iframe[^>]*>',
+        ]),
+        re.IGNORECASE | re.DOTALL
+    )
+
+
+# Every malicious-content branch needs one of these characters, except the
+# SQL keywords; "exec" also covers "execute"
+_MALICIOUS_CANARY_CHARS = ';\'"\\-/*<:='
+_MALICIOUS_KEYWORDS = (
+    'union', 'select', 'insert', 'update', 'delete', 'drop', 'create', 'alter', 'exec'
+)
+
+
+def _is_plainly_benign(text: str) -> bool:
+    """
+    Cheaply rule out malicious content before running the full regex.
+    
+    Args:
+        text: Input text to screen
+        
+    Returns:
+        True if the text cannot match the malicious-content pattern, False if
+        it needs the full scan
+    """
+    # Case-insensitive matching also folds some non-ASCII letters onto ASCII ones
+    if not text.isascii():
+        return False
+    
+    for char in _MALICIOUS_CANARY_CHARS:
+        if char in text:
+            return False
+    
+    text = text.lower()
+    for keyword in _MALICIOUS_KEYWORDS:
+        if keyword in text:
+            return False
+    
+    return True
 
 
 class InputValidator:
@@ -23,27 +164,21 @@ class InputValidator:
     with proper error handling and security considerations.
     """
     
-    # OSRS username validation pattern
-    OSRS_USERNAME_PATTERN = re.compile(r'^[a-zA-Z0-9 _-]{1,12}$')
+    # Characters allowed in OSRS usernames (length is checked separately)
+    OSRS_USERNAME_CHARS = (
+        b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 _-'
+    )
     
-    # Discord ID validation (snowflake format)
-    DISCORD_ID_PATTERN = re.compile(r'^\d{17,19}$')
+    # Words OSRS usernames may not contain
+    RESERVED_USERNAME_PATTERN = re.compile(r'mod|admin|jagex|staff', re.IGNORECASE)
     
-    # Common SQL injection patterns
-    SQL_INJECTION_PATTERNS = [
-        re.compile(r'\b(union|select|insert|update|delete|drop|create|alter|exec|execute)\b', re.IGNORECASE),
-        re.compile(r'[;\'"\\]'),
-        re.compile(r'--'),
-        re.compile(r'/\*|\*/')
-    ]
+    # Hosts URLs may not point at
+    DANGEROUS_DOMAIN_PATTERN = re.compile(r'localhost|127\.0\.0\.1|0\.0\.0\.0|::1', re.IGNORECASE)
     
-    # XSS patterns
-    XSS_PATTERNS = [
-        re.compile(r'<script[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL),
-        re.compile(r'javascript:', re.IGNORECASE),
-        re.compile(r'on\w+\s*=', re.IGNORECASE),
-        re.compile(r'<iframe[^>]*>', re.IGNORECASE)
-    ]
+    # Characters and sequences not allowed in filenames, in reporting order
+    DANGEROUS_FILENAME_CHARS = ['/', '\\', '..', '<', '>', ':', '"', '|', '?', '*']
+    # Deletes every single dangerous character, so a length change means one was present
+    _FILENAME_CHAR_DELETE_TABLE = str.maketrans('', '', '/\\<>:"|?*')
     
     @staticmethod
     def sanitize_input(text: str, max_length: Optional[int] = None) -> str:
@@ -63,18 +198,12 @@ class InputValidator:
         if not isinstance(text, str):
             raise ValidationError(f"Expected string, got {type(text).__name__}")
         
-        # Check for SQL injection patterns
-        for pattern in InputValidator.SQL_INJECTION_PATTERNS:
-            if pattern.search(text):
-                raise ValidationError("Input contains potentially malicious content")
+        # Check for SQL injection and XSS patterns
+        if not _is_plainly_benign(text) and _malicious_pattern().search(text):
+            raise ValidationError("Input contains potentially malicious content")
         
-        # Check for XSS patterns
-        for pattern in InputValidator.XSS_PATTERNS:
-            if pattern.search(text):
-                raise ValidationError("Input contains potentially malicious content")
-        
-        # HTML escape
-        sanitized = html.escape(text.strip())
+        # HTML escape; quotes were already rejected above, so skip those passes
+        sanitized = html.escape(text.strip(), quote=False)
         
         # Validate length
         if max_length and len(sanitized) > max_length:
@@ -82,6 +211,25 @@ class InputValidator:
         
         return sanitized
     
+    @staticmethod
+    def _normalize_token(text: str) -> str:
+        """
+        Normalize a token that is about to be checked against a whitelist.
+        
+        Args:
+            text: Token to normalize
+            
+        Returns:
+            Stripped, lowercased token
+            
+        Raises:
+            ValidationError: If token is not a string
+        """
+        if not isinstance(text, str):
+            raise ValidationError(f"Expected string, got {type(text).__name__}")
+        
+        return text.strip().lower()
+    
     @staticmethod
     def validate_osrs_username(username: str) -> str:
         """
@@ -107,14 +255,16 @@ class InputValidator:
         if len(username) > 12:
             raise ValidationError("OSRS username cannot exceed 12 characters")
         
-        if not InputValidator.OSRS_USERNAME_PATTERN.match(username):
+        # Deleting every allowed byte must leave nothing behind
+        if not username.isascii() or username.encode('ascii').translate(
+            None, InputValidator.OSRS_USERNAME_CHARS
+        ):
             raise ValidationError(
                 "Invalid OSRS username. Only letters, numbers, spaces, hyphens, and underscores allowed"
             )
         
         # Check for reserved words or inappropriate content
-        reserved_words = ['mod', 'admin', 'jagex', 'staff']
-        if any(word in username.lower() for word in reserved_words):
+        if InputValidator.RESERVED_USERNAME_PATTERN.search(username):
             raise ValidationError("Username contains reserved words")
         
         return username
@@ -133,21 +283,21 @@ class InputValidator:
         Raises:
             ValidationError: If Discord ID is invalid
         """
-        if isinstance(discord_id, int):
-            discord_id_str = str(discord_id)
-        elif isinstance(discord_id, str):
+        discord_id_type = type(discord_id)
+        if discord_id_type is int:
+            # 17-19 digits, same as the string format, without a str() round trip
+            if not 10**16 <= discord_id < 10**19:
+                raise ValidationError("Invalid Discord ID format")
+            discord_id_int = discord_id
+        elif discord_id_type is str:
             discord_id_str = discord_id.strip()
+            # isdecimal() accepts exactly what int() parses as digits
+            if not (17 <= len(discord_id_str) <= 19 and discord_id_str.isdecimal()):
+                raise ValidationError("Invalid Discord ID format")
+            discord_id_int = int(discord_id_str)
         else:
             raise ValidationError(f"Discord ID must be string or int, got {type(discord_id).__name__}")
         
-        if not InputValidator.DISCORD_ID_PATTERN.match(discord_id_str):
-            raise ValidationError("Invalid Discord ID format")
-        
-        try:
-            discord_id_int = int(discord_id_str)
-        except ValueError:
-            raise ValidationError("Discord ID must be numeric")
-        
         # Basic range check (Discord IDs started around 2015)
         min_discord_id = 100000000000000000  # Approximate minimum valid Discord ID
         if discord_id_int < min_discord_id:
@@ -215,12 +365,12 @@ class InputValidator:
         Raises:
             ValidationError: If duration is invalid
         """
+        coerce = _DURATION_COERCIONS.get(type(duration), int)
+        if coerce is None:
+            raise ValidationError("Duration must be a number")
+        
         try:
-            if isinstance(duration, str):
-                duration = float(duration.strip())
-            
-            duration_int = int(duration)
-            
+            duration_int = coerce(duration)
         except (ValueError, TypeError):
             raise ValidationError("Duration must be a number")
         
@@ -246,12 +396,12 @@ class InputValidator:
         Raises:
             ValidationError: If count is invalid
         """
+        coerce = _INT_COERCIONS.get(type(count), int)
+        if coerce is None:
+            raise ValidationError("Participant count must be a number")
+        
         try:
-            if isinstance(count, str):
-                count = int(count.strip())
-            
-            count_int = int(count)
-            
+            count_int = coerce(count)
         except (ValueError, TypeError):
             raise ValidationError("Participant count must be a number")
         
@@ -277,21 +427,13 @@ class InputValidator:
         Raises:
             ValidationError: If skill name is invalid
         """
-        skill = InputValidator.sanitize_input(skill)
-        
-        # OSRS skills list
-        valid_skills = [
-            'attack', 'defence', 'strength', 'hitpoints', 'ranged', 'prayer',
-            'magic', 'cooking', 'woodcutting', 'fletching', 'fishing', 'firemaking',
-            'crafting', 'smithing', 'mining', 'herblore', 'agility', 'thieving',
-            'slayer', 'farming', 'runecrafting', 'hunter', 'construction'
-        ]
+        # Known skills are plain words, so they need no sanitizing
+        skill_lower = InputValidator._normalize_token(skill)
+        if skill_lower in _VALID_SKILLS:
+            return skill_lower
         
-        skill_lower = skill.lower()
-        if skill_lower not in valid_skills:
-            raise ValidationError(f"Invalid skill name: {skill}")
-        
-        return skill_lower
+        skill = InputValidator.sanitize_input(skill)
+        raise ValidationError(f"Invalid skill name: {skill}")
     
     @staticmethod
     def validate_boss_name(boss: str) -> str:
@@ -307,26 +449,18 @@ class InputValidator:
         Raises:
             ValidationError: If boss name is invalid
         """
+        # Known bosses are returned as-is; only custom names are sanitized
+        boss_lower = InputValidator._normalize_token(boss)
+        if boss_lower in _VALID_BOSSES:
+            return boss_lower
+        
         boss = InputValidator.sanitize_input(boss)
         
-        # Common OSRS bosses (not exhaustive, can be expanded)
-        valid_bosses = [
-            'zulrah', 'vorkath', 'alchemical hydra', 'cerberus', 'kraken',
-            'abyssal sire', 'grotesque guardians', 'thermonuclear smoke devil',
-            'chaos elemental', 'crazy archaeologist', 'scorpia', 'venenatis',
-            'callisto', 'vet\'ion', 'chaos fanatic', 'king black dragon',
-            'giant mole', 'deranged archaeologist', 'sarachnis', 'tempoross',
-            'wintertodt', 'zalcano', 'gauntlet', 'corrupted gauntlet',
-            'theatre of blood', 'chambers of xeric', 'tombs of amascut'
-        ]
-        
-        boss_lower = boss.lower()
-        if boss_lower not in valid_bosses:
-            # Allow custom boss names but validate format
-            if len(boss) < 2 or len(boss) > 50:
-                raise ValidationError("Boss name must be 2-50 characters")
-        
-        return boss_lower
+        # Allow custom boss names but validate format
+        if len(boss) < 2 or len(boss) > 50:
+            raise ValidationError("Boss name must be 2-50 characters")
+        
+        return boss.lower()
     
     @staticmethod
     def validate_url(url: str) -> str:
@@ -347,23 +481,16 @@ class InputValidator:
         if not url:
             raise ValidationError("URL cannot be empty")
         
-        try:
-            parsed = urlparse(url)
-        except Exception:
-            raise ValidationError("Invalid URL format")
+        scheme, netloc = _split_scheme_host(url)
         
-        if not parsed.scheme or not parsed.netloc:
+        if not scheme or not netloc:
             raise ValidationError("URL must include protocol and domain")
         
-        if parsed.scheme not in ['http', 'https']:
+        if scheme not in ('http', 'https'):
             raise ValidationError("URL must use HTTP or HTTPS protocol")
         
         # Block potentially dangerous domains
-        dangerous_domains = [
-            'localhost', '127.0.0.1', '0.0.0.0', '::1'
-        ]
-        
-        if any(domain in parsed.netloc.lower() for domain in dangerous_domains):
+        if InputValidator.DANGEROUS_DOMAIN_PATTERN.search(netloc):
             raise ValidationError("URL points to potentially dangerous domain")
         
         return url
@@ -383,11 +510,7 @@ class InputValidator:
             ValidationError: If date format is invalid
         """
         try:
-            # Handle both with and without timezone
-            if date_str.endswith('Z'):
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            else:
-                return datetime.fromisoformat(date_str)
+            return parse_iso_timestamp(date_str)
         except ValueError as e:
             raise ValidationError(f"Invalid date format: {e}")
     
@@ -411,12 +534,12 @@ class InputValidator:
         Raises:
             ValidationError: If value is invalid
         """
+        coerce = _INT_COERCIONS.get(type(value), int)
+        if coerce is None:
+            raise ValidationError(f"{field_name} must be a number")
+        
         try:
-            if isinstance(value, str):
-                value = int(value.strip())
-            
-            value_int = int(value)
-            
+            value_int = coerce(value)
         except (ValueError, TypeError):
             raise ValidationError(f"{field_name} must be a number")
         
@@ -447,22 +570,21 @@ class InputValidator:
         Raises:
             ValidationError: If value is not in choices
         """
-        value = value.strip()
-        
         if case_sensitive:
+            value = value.strip()
             if value not in choices:
                 raise ValidationError(
                     f"Invalid {field_name}. Must be one of: {', '.join(choices)}"
                 )
         else:
-            value_lower = value.lower()
-            choices_lower = [choice.lower() for choice in choices]
-            if value_lower not in choices_lower:
+            value_lower = InputValidator._normalize_token(value)
+            original = _lower_choices(tuple(choices)).get(value_lower)
+            if original is None:
                 raise ValidationError(
                     f"Invalid {field_name}. Must be one of: {', '.join(choices)}"
                 )
             # Return the original case from choices
-            value = choices[choices_lower.index(value_lower)]
+            value = original
         
         return value
     
@@ -513,11 +635,11 @@ class InputValidator:
         if not filename:
             raise ValidationError("Filename cannot be empty")
         
-        # Remove dangerous characters
-        dangerous_chars = ['/', '\\', '..', '<', '>', ':', '"', '|', '?', '*']
-        for char in dangerous_chars:
-            if char in filename:
-                raise ValidationError(f"Filename contains invalid character: {char}")
+        # Reject dangerous characters
+        if ('..' in filename or
+                len(filename.translate(InputValidator._FILENAME_CHAR_DELETE_TABLE)) != len(filename)):
+            char = next(char for char in InputValidator.DANGEROUS_FILENAME_CHARS if char in filename)
+            raise ValidationError(f"Filename contains invalid character: {char}")
         
         # Limit length
         if len(filename) > 255: